@@ -5,24 +5,106 @@ import shutil
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 
-# Add support directory to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'support')))
+import docker
+
+# Add support directory to path for imports. Behave loads this module before
+# any step module, so step definitions can import support code without
+# touching sys.path themselves.
+SUPPORT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'support'))
+if SUPPORT_DIR not in sys.path:
+    sys.path.insert(0, SUPPORT_DIR)
+
+from scenario_build import release_live_containers
+
+
+# BuildKit builder and local layer cache shared by every image build in the run.
+# The docker-container driver is required to export a local cache.
+BUILDER_NAME = "isolde-e2e"
+BUILD_CACHE_DIR = os.path.join(tempfile.gettempdir(), "isolde-e2e-cache")
+
+# Size bound for the local cache dir and for the builder's own cache, which
+# otherwise keep every layer from every run
+BUILD_CACHE_MAX_BYTES = 10 * 1024 ** 3
+
+# Base images isolde init writes into isolde.yaml for each template
+BASE_IMAGES = [
+    "mcr.microsoft.com/devcontainers/base:ubuntu",
+    "mcr.microsoft.com/devcontainers/python:3.12",
+    "mcr.microsoft.com/devcontainers/javascript-node:22",
+    "mcr.microsoft.com/devcontainers/rust:latest",
+    "mcr.microsoft.com/devcontainers/go:1.22",
+]
 
 # Global container pool for reusing containers across scenarios
 # Key: template name, Value: (container_name, image_name)
 CONTAINER_POOL = {}
 
-# Global image registry for tracking built images
+# Global image registry for tracking built images, removed in after_all
 # Key: project_name, Value: image_name
 IMAGE_REGISTRY = {}
 
 
+# Step that builds the scenario's test image and starts its container
+BUILD_STEP = "the devcontainer should build successfully"
+
+# Base images already pulled into the daemon for devcontainer up
+_DAEMON_IMAGES = set()
+
+# Base images already fetched into the shared builder's content store
+_BUILDER_IMAGES = set()
+
+
+def before_feature(context, feature):
+    """Set up feature-scoped resources and fetch the base images its scenarios build on."""
+    # The last built test image and its running container are kept across
+    # the feature's scenarios, so consecutive scenarios with the same build
+    # inputs exec into the same container; they are removed with the feature
+    context._live_containers = {}
+    context._feature_stack = ExitStack()
+    context._feature_stack.callback(release_live_containers, context.docker, context._live_containers)
+
+    if not context.docker_available:
+        return
+    step_names = {step.name for scenario in feature.walk_scenarios() for step in scenario.steps}
+
+    # Fetch base images into the shared builder before the feature's first
+    # build, overlapping the pulls
+    if BUILD_STEP in step_names:
+        pending = [image for image in BASE_IMAGES if image not in _BUILDER_IMAGES]
+        warm = partial(_warm_base_image, platform=context.build_platform)
+        for image, warmed in zip(pending, context._pool.map(warm, pending)):
+            if warmed:
+                _BUILDER_IMAGES.add(image)
+
+    # devcontainer up builds with the daemon rather than the shared builder,
+    # so fetch its base images concurrently instead of inside the first up
+    if "I start the devcontainer for the project" in step_names:
+        pending = [image for image in BASE_IMAGES if image not in _DAEMON_IMAGES]
+        for image, pulled in zip(pending, context._pool.map(partial(_pull_image, context.docker), pending)):
+            if pulled:
+                _DAEMON_IMAGES.add(image)
+
+
+def after_feature(context, feature):
+    """Release the feature's resources."""
+    context._feature_stack.close()
+
+
 def before_scenario(context, scenario):
     """Setup workspace before each scenario."""
-    context.test_workspace = tempfile.mkdtemp(prefix="e2e-")
+    context.test_workspace = tempfile.mkdtemp(prefix="e2e-", dir=context._scratch_dir)
     context.test_images = []
     context.test_containers = []
+    context.build_ok = False
+    context._tool_versions = {}
+
+    # Only a scenario that builds can reuse the warm test container
+    if not any(step.name == BUILD_STEP for step in scenario.all_steps):
+        release_live_containers(context.docker, context._live_containers)
 
     # Expose global pools to context for step definitions
     context.CONTAINER_POOL = CONTAINER_POOL
@@ -31,58 +113,183 @@ def before_scenario(context, scenario):
 
 def after_scenario(context, scenario):
     """Cleanup after each scenario."""
-    # Stop and remove test containers
-    for container in getattr(context, 'test_containers', []):
-        subprocess.run(f"docker stop {container}", shell=True, capture_output=True)
-        subprocess.run(f"docker rm {container}", shell=True, capture_output=True)
+    # Image and workspace removal runs in the background, overlapping the
+    # next scenario; every image tag and workspace is unique to its scenario
+    if hasattr(context, 'test_workspace'):
+        context._cleanup_pool.submit(_remove_tree, context.test_workspace)
+    if not context.docker_available:
+        return
 
-    # Remove test images
-    for image in getattr(context, 'test_images', []):
-        subprocess.run(f"docker rmi {image} -f", shell=True, capture_output=True)
+    # Containers go first and synchronously: pooled containers are looked
+    # up by name, so the next scenario must not find one still running
+    _remove_containers(context.docker, getattr(context, 'test_containers', []))
 
-    # Remove workspace
-    if hasattr(context, 'test_workspace'):
-        shutil.rmtree(context.test_workspace, ignore_errors=True)
+    # The list is copied now so the next scenario's images are never removed with it
+    images = list(getattr(context, 'test_images', []))
+    context._cleanup_pool.submit(_remove_images, context.docker, images)
 
 
 def before_all(context):
     """Setup before all scenarios run."""
+    # Keep scenario workspaces in RAM when a tmpfs is available; E2E_TMPDIR
+    # overrides the location (e.g. a disk-backed dir for very large projects)
+    context._scratch_dir = os.environ.get("E2E_TMPDIR") or (
+        "/dev/shm" if os.path.ismount("/dev/shm") else tempfile.gettempdir()
+    )
+
+    # Worker pool for concurrent project creation, shared across scenarios
+    context._pool = ThreadPoolExecutor(max_workers=8)
+
+    # Scenario teardown, kept apart so cleanup never queues behind pool work
+    context._cleanup_pool = ThreadPoolExecutor(max_workers=2)
+
+    # Persistent Docker API client; every docker call reuses its connection
+    # instead of starting the docker CLI. The daemon is checked once here so
+    # that without it, docker steps skip their scenario instead of each
+    # waiting on a connection failure.
+    try:
+        context.docker = docker.from_env(timeout=600)
+        context.docker.ping()
+    except (docker.errors.DockerException, OSError):
+        context.docker = None
+    context.docker_available = context.docker is not None
+    if not context.docker_available:
+        return
+
+    # Shared BuildKit builder and layer cache (creating an existing builder is a no-op failure).
+    # Cache exports only ever add blobs, so an oversized cache dir is started afresh.
+    if _tree_size(BUILD_CACHE_DIR) > BUILD_CACHE_MAX_BYTES:
+        _remove_tree(BUILD_CACHE_DIR)
+    os.makedirs(BUILD_CACHE_DIR, exist_ok=True)
+    subprocess.run(
+        ["docker", "buildx", "create", "--name", BUILDER_NAME, "--driver", "docker-container"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    context.builder = BUILDER_NAME
+    context.build_cache_dir = BUILD_CACHE_DIR
+
+    # Pin builds to the daemon's native platform so cached layers always match
+    context.build_platform = f"linux/{context.docker.version().get('Arch', 'amd64')}"
+
     # Ensure clean state at start
-    _cleanup_orphaned_containers()
-    _cleanup_orphaned_images()
+    _cleanup_orphaned_containers(context.docker)
+    _cleanup_orphaned_images(context.docker)
 
 
 def after_all(context):
     """Cleanup after all scenarios complete."""
+    context._pool.shutdown(wait=True)
+    context._cleanup_pool.shutdown(wait=True)
+
+    if not context.docker_available:
+        return
+
     # Clean up any remaining pooled containers
-    for template, (container_name, _) in list(CONTAINER_POOL.items()):
-        subprocess.run(f"docker stop {container_name}", shell=True, capture_output=True)
-        subprocess.run(f"docker rm {container_name}", shell=True, capture_output=True)
+    _remove_containers(context.docker, [name for name, _ in CONTAINER_POOL.values()])
     CONTAINER_POOL.clear()
 
     # Clean up any remaining images
-    for image in IMAGE_REGISTRY.values():
-        subprocess.run(f"docker rmi {image} -f", shell=True, capture_output=True)
+    _remove_images(context.docker, list(IMAGE_REGISTRY.values()))
     IMAGE_REGISTRY.clear()
 
+    context.docker.close()
 
-def _cleanup_orphaned_containers():
-    """Remove any orphaned e2e test containers."""
-    result = subprocess.run(
-        "docker ps -a --filter 'name=e2e-' --format '{{{{.Names}}}}'",
-        shell=True, capture_output=True, text=True
+    # Trim the builder's cache, then stop its BuildKit container; the state
+    # volume is kept for the next run
+    subprocess.run(
+        ["docker", "buildx", "prune", "--builder", BUILDER_NAME, "--force",
+         f"--keep-storage={BUILD_CACHE_MAX_BYTES}"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
     )
-    if result.returncode == 0 and result.stdout.strip():
-        for container in result.stdout.strip().split('\n'):
-            subprocess.run(f"docker rm -f {container}", shell=True, capture_output=True)
+    subprocess.run(["docker", "buildx", "rm", "--keep-state", BUILDER_NAME], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _warm_base_image(image, platform):
+    """Pull a base image into the shared builder's content store, reporting whether it succeeded.
+
+    Scenario images are built by the docker-container builder, which keeps
+    its own image store, so a plain docker pull would not help those builds.
+    """
+    # before_feature waits on every warm-up, so a hung pull must not block it
+    try:
+        result = subprocess.run(
+            ["docker", "buildx", "build", "--builder", BUILDER_NAME, "--platform", platform, "-"],
+            input=f"FROM {image}\n".encode(),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=600
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    return result.returncode == 0
+
+
+def _pull_image(client, image):
+    """Pull an image into the daemon, reporting whether it succeeded."""
+    # images.pull waits for the pull to finish and then looks the image up,
+    # so a pull that failed partway raises instead of returning normally
+    try:
+        client.images.pull(image)
+    except Exception:
+        # Best effort: a failed or stalled pull (the client's read timeout
+        # surfaces as a requests error) is left to devcontainer up to retry
+        return False
+    return True
+
+
+def _list_images(client):
+    """List local images as repository:tag references."""
+    try:
+        return [tag for image in client.api.images() for tag in image.get("RepoTags") or []]
+    except docker.errors.APIError:
+        return []
 
 
-def _cleanup_orphaned_images():
+def _remove_containers(client, containers):
+    """Force-remove containers, ignoring ones that are already gone."""
+    for container in containers:
+        try:
+            client.api.remove_container(container, force=True)
+        except docker.errors.APIError:
+            pass
+
+
+def _remove_images(client, images):
+    """Force-remove images, ignoring ones that are already gone."""
+    for image in images:
+        try:
+            client.api.remove_image(image, force=True)
+        except docker.errors.APIError:
+            pass
+
+
+def _remove_tree(path):
+    """Remove a directory tree, preferring native rm -rf for large workspaces."""
+    if os.name == 'posix':
+        subprocess.run(["rm", "-rf", path], check=False)
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _tree_size(path):
+    """Return the total size in bytes of the files under a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _cleanup_orphaned_containers(client):
+    """Remove any orphaned e2e test containers."""
+    try:
+        containers = client.api.containers(all=True, filters={"name": "e2e-"})
+    except docker.errors.APIError:
+        return
+    _remove_containers(client, [container["Id"] for container in containers])
+
+
+def _cleanup_orphaned_images(client):
     """Remove any orphaned e2e test images."""
-    result = subprocess.run(
-        "docker images --format '{{{{.Repository}}}:{{{{.Tag}}}}' | grep '^e2e-'",
-        shell=True, capture_output=True, text=True
-    )
-    if result.returncode == 0 and result.stdout.strip():
-        for image in result.stdout.strip().split('\n'):
-            subprocess.run(f"docker rmi -f {image}", shell=True, capture_output=True)
+    _remove_images(client, [image for image in _list_images(client) if image.startswith("e2e-")])
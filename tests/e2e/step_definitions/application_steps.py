@@ -11,8 +11,6 @@ unique steps not found elsewhere.
 """
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import then, given, when
 import subprocess
@@ -28,15 +26,13 @@ def step_run_python_script(context):
     """Verify we can run Python code in the container."""
     if hasattr(context, 'test_image'):
         result = subprocess.run(
-            f'docker run --rm {context.test_image} python3 -c "print(\'Hello from Python\')"',
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "python3", "-c", "print('Hello from Python')"],
             capture_output=True,
             text=True
         )
         if result.returncode != 0 and "unable to find user" in result.stderr:
             result = subprocess.run(
-                f'docker run --rm --user root {context.test_image} python3 -c "print(\'Hello from Python\')"',
-                shell=True,
+                ["docker", "run", "--rm", "--user", "root", context.test_image, "python3", "-c", "print('Hello from Python')"],
                 capture_output=True,
                 text=True
             )
@@ -61,8 +57,7 @@ def step_create_jupyter_notebook(context):
     """Verify Jupyter is available."""
     if hasattr(context, 'test_image'):
         result = subprocess.run(
-            f'docker run --rm {context.test_image} jupyter --version',
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "jupyter", "--version"],
             capture_output=True,
             text=True
         )
@@ -102,15 +97,13 @@ def step_create_express_api(context):
     # Just verify Node.js and npm are available
     if hasattr(context, 'test_image'):
         result = subprocess.run(
-            f'docker run --rm {context.test_image} npm --version',
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "npm", "--version"],
             capture_output=True,
             text=True
         )
         if result.returncode != 0 and "unable to find user" in result.stderr:
             result = subprocess.run(
-                f'docker run --rm --user root {context.test_image} npm --version',
-                shell=True,
+                ["docker", "run", "--rm", "--user", "root", context.test_image, "npm", "--version"],
                 capture_output=True,
                 text=True
             )
@@ -138,15 +131,13 @@ def step_build_rust_binary(context):
     """Verify we can build Rust projects."""
     if hasattr(context, 'test_image'):
         result = subprocess.run(
-            f'docker run --rm {context.test_image} cargo --version',
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "cargo", "--version"],
             capture_output=True,
             text=True
         )
         if result.returncode != 0 and "unable to find user" in result.stderr:
             result = subprocess.run(
-                f'docker run --rm --user root {context.test_image} cargo --version',
-                shell=True,
+                ["docker", "run", "--rm", "--user", "root", context.test_image, "cargo", "--version"],
                 capture_output=True,
                 text=True
             )
@@ -174,15 +165,13 @@ def step_create_go_module(context):
     """Verify we can work with Go modules."""
     if hasattr(context, 'test_image'):
         result = subprocess.run(
-            f'docker run --rm {context.test_image} go version',
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "go", "version"],
             capture_output=True,
             text=True
         )
         if result.returncode != 0 and "unable to find user" in result.stderr:
             result = subprocess.run(
-                f'docker run --rm --user root {context.test_image} go version',
-                shell=True,
+                ["docker", "run", "--rm", "--user", "root", context.test_image, "go", "version"],
                 capture_output=True,
                 text=True
             )
@@ -211,15 +200,13 @@ def step_create_fullstack_project(context):
     # Verify both Node.js and Python are available for fullstack
     if hasattr(context, 'test_image'):
         result = subprocess.run(
-            f'docker run --rm {context.test_image} npm --version',
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "npm", "--version"],
             capture_output=True,
             text=True
         )
         if result.returncode != 0 and "unable to find user" in result.stderr:
             result = subprocess.run(
-                f'docker run --rm --user root {context.test_image} npm --version',
-                shell=True,
+                ["docker", "run", "--rm", "--user", "root", context.test_image, "npm", "--version"],
                 capture_output=True,
                 text=True
             )
@@ -250,17 +237,14 @@ def step_basic_tools_available(context):
     for tool in tools_to_check:
         if hasattr(context, 'test_image'):
             result = subprocess.run(
-                f'docker run --rm {context.test_image} which {tool}',
-                shell=True,
-                capture_output=True,
-                text=True
+                ["docker", "run", "--rm", context.test_image, "which", tool],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
         elif hasattr(context, 'test_project_path'):
             result = subprocess.run(
                 ["isolde", "exec", "which", tool],
                 cwd=context.test_project_path,
-                capture_output=True,
-                text=True
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
         else:
             continue
@@ -279,8 +263,7 @@ def step_run_shell_commands(context):
     """Verify shell commands work."""
     if hasattr(context, 'test_image'):
         result = subprocess.run(
-            f'docker run --rm {context.test_image} bash -c "echo test && pwd"',
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "bash", "-c", "echo test && pwd"],
             capture_output=True,
             text=True
         )
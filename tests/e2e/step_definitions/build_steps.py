@@ -2,17 +2,15 @@
 """Step definitions for Layer 1 build matrix testing."""
 
 import os
-import sys
 import json
 import subprocess
 import time
 import signal
 from pathlib import Path
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
-
 from behave import given, when, then
 from generators import get_generator
+import json_cache
 
 
 def get_isolde_binary_path():
@@ -58,7 +56,7 @@ def run_isolde_command(args, cwd=None, timeout=300):
         return result
     except subprocess.TimeoutExpired:
         # Kill any child processes
-        subprocess.run(["pkill", "-9", "-f", "isolde"], capture_output=True)
+        subprocess.run(["pkill", "-9", "-f", "isolde"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         raise
 
 
@@ -198,6 +196,8 @@ def step_isolde_sync(context):
 
     context.sync_exit_code = result.returncode
     context.sync_output = result.stdout + result.stderr
+    # The project was rewritten; drop validation_steps' structure snapshot
+    context._fs_root = None
 
     # Verify sync succeeded
     assert result.returncode == 0, f"isolde sync failed: {context.sync_output}"
@@ -206,10 +206,13 @@ def step_isolde_sync(context):
 @when('the devcontainer should build successfully')
 def step_isolde_build(context):
     """Build the devcontainer image using isolde build command."""
+    if not context.docker_available:
+        context.scenario.skip("Docker daemon is not available")
+        return
     project_path = os.path.join(context.test_workspace, context.project_name)
 
     # Generate a unique image name for this test
-    context.test_image = f"e2e-{context.project_name}-{int(time.time())}"
+    context.test_image = f"e2e-{context.project_name}-{time.monotonic_ns():x}"
 
     # Run isolde build with timeout
     try:
@@ -246,15 +249,13 @@ def step_claude_code_installed(context):
         return
 
     result = subprocess.run(
-        f"docker run --rm {context.test_image} claude --version",
-        shell=True,
+        ["docker", "run", "--rm", context.test_image, "claude", "--version"],
         capture_output=True,
         text=True
     )
     if result.returncode != 0 and "unable to find user" in result.stderr:
         result = subprocess.run(
-            f"docker run --rm --user root {context.test_image} claude --version",
-            shell=True,
+            ["docker", "run", "--rm", "--user", "root", context.test_image, "claude", "--version"],
             capture_output=True,
             text=True
         )
@@ -270,8 +271,7 @@ def step_claude_provider_configured(context, provider):
 
     # Check provider configuration in CLAUDE.md or environment
     result = subprocess.run(
-        f"docker run --rm {context.test_image} cat /workspaces/.claude/CLAUDE.md",
-        shell=True,
+        ["docker", "run", "--rm", context.test_image, "cat", "/workspaces/.claude/CLAUDE.md"],
         capture_output=True,
         text=True
     )
@@ -283,8 +283,7 @@ def step_claude_provider_configured(context, provider):
     else:
         # Fallback: check environment variable
         result = subprocess.run(
-            f"docker run --rm {context.test_image} printenv CLAUDE_PROVIDER",
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "printenv", "CLAUDE_PROVIDER"],
             capture_output=True,
             text=True
         )
@@ -299,15 +298,13 @@ def step_omc_plugin_activated(context):
         return
 
     result = subprocess.run(
-        f"docker run --rm {context.test_image} ls -la /root/.claude/",
-        shell=True,
+        ["docker", "run", "--rm", context.test_image, "ls", "-la", "/root/.claude/"],
         capture_output=True,
         text=True
     )
     if result.returncode != 0 and "unable to find user" in result.stderr:
         result = subprocess.run(
-            f"docker run --rm --user root {context.test_image} ls -la /root/.claude/",
-            shell=True,
+            ["docker", "run", "--rm", "--user", "root", context.test_image, "ls", "-la", "/root/.claude/"],
             capture_output=True,
             text=True
         )
@@ -321,21 +318,20 @@ def step_plugin_available(context, plugin):
     if not hasattr(context, 'test_image'):
         return
 
-    # Check if plugin directory exists
+    # Check if plugin directory exists; the listing is matched here rather
+    # than piped through grep in a shell
     result = subprocess.run(
-        f"docker run --rm {context.test_image} ls -la /root/.claude/ | grep -i {plugin}",
-        shell=True,
+        ["docker", "run", "--rm", context.test_image, "ls", "-la", "/root/.claude/"],
         capture_output=True,
         text=True
     )
 
     # Plugin availability is verified by directory existence or config
-    # Non-zero return code is okay for some plugins that don't create directories
-    if result.returncode != 0:
+    # A missing match is okay for some plugins that don't create directories
+    if result.returncode != 0 or plugin.lower() not in result.stdout.lower():
         # Alternative check: look in CLAUDE.md
         result = subprocess.run(
-            f"docker run --rm {context.test_image} cat /workspaces/.claude/CLAUDE.md | grep -i {plugin}",
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, "cat", "/workspaces/.claude/CLAUDE.md"],
             capture_output=True,
             text=True
         )
@@ -376,8 +372,7 @@ def step_core_tools_available(context, template):
 
     for cmd, name in tools:
         result = subprocess.run(
-            f"docker run --rm {context.test_image} {cmd}",
-            shell=True,
+            ["docker", "run", "--rm", context.test_image, *cmd.split()],
             capture_output=True,
             text=True
         )
@@ -395,8 +390,7 @@ def step_features_valid(context):
     project_path = os.path.join(context.test_workspace, context.project_name)
     devcontainer_json = os.path.join(project_path, ".devcontainer", "devcontainer.json")
 
-    with open(devcontainer_json, 'r') as f:
-        config = json.load(f)
+    config = json_cache.load(devcontainer_json)
 
     # Check that features exists and is valid (devcontainers spec uses object format)
     assert "features" in config, "No features defined in devcontainer.json"
@@ -411,8 +405,7 @@ def step_image_tagged(context, template):
 
     # Verify image exists
     result = subprocess.run(
-        f"docker images {context.test_image} --format '{{{{.Repository}}:{{.Tag}}}}'",
-        shell=True,
+        ["docker", "images", context.test_image, "--format", "{{.Repository}}:{{.Tag}}"],
         capture_output=True,
         text=True
     )
@@ -2,13 +2,8 @@
 """Step definitions for concurrent operation tests."""
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import when, then, given
-import subprocess
-import threading
-import time
 
 
 @when('I create projects named {names} using template "{template}" simultaneously')
@@ -18,28 +13,16 @@ def step_create_concurrent(context, names, template):
     name_list = [n.strip().strip('"') for n in names.split(',')]
     context.concurrent_projects = name_list
 
-    threads = []
-    results = {}
-    lock = threading.Lock()
-
-    def create_project(name):
-        result = context.generator.generate(
+    futures = {
+        name: context._pool.submit(
+            context.generator.generate,
             name,
             workspace=context.test_workspace,
             template=template
         )
-        with lock:
-            results[name] = result
-
-    for name in name_list:
-        thread = threading.Thread(target=create_project, args=(name,))
-        threads.append(thread)
-        thread.start()
-
-    for thread in threads:
-        thread.join()
-
-    context.concurrent_results = results
+        for name in name_list
+    }
+    context.concurrent_results = {name: future.result() for name, future in futures.items()}
 
 
 @then('all projects should be created successfully')
@@ -54,17 +37,22 @@ def step_all_created(context):
 @then('each project should have independent structure')
 def step_independent_structure(context):
     """Verify each project has its own independent structure."""
-    for name in context.concurrent_projects:
-        project_path = os.path.join(context.test_workspace, name)
+    # One directory listing of the workspace instead of a stat per path
+    with os.scandir(context.test_workspace) as it:
+        entries = {entry.name: entry for entry in it}
 
+    for name in context.concurrent_projects:
         # Check basic structure exists
-        assert os.path.isdir(project_path), f"Project directory {name} not found"
+        project = entries.get(name)
+        assert project is not None and project.is_dir(), f"Project directory {name} not found"
 
-        devcontainer_path = os.path.join(project_path, ".devcontainer")
-        assert os.path.isdir(devcontainer_path), f".devcontainer not found in {name}"
+        with os.scandir(project.path) as it:
+            devcontainer = next((entry for entry in it if entry.name == ".devcontainer"), None)
+        assert devcontainer is not None and devcontainer.is_dir(), f".devcontainer not found in {name}"
 
-        devcontainer_json = os.path.join(devcontainer_path, "devcontainer.json")
-        assert os.path.isfile(devcontainer_json), f"devcontainer.json not found in {name}"
+        with os.scandir(devcontainer.path) as it:
+            has_json = any(entry.name == "devcontainer.json" and entry.is_file() for entry in it)
+        assert has_json, f"devcontainer.json not found in {name}"
 
 
 @when('I create "{name1}" using template "{template1}" and "{name2}" using template "{template2}" simultaneously')
@@ -72,28 +60,16 @@ def step_create_different_concurrent(context, name1, template1, name2, template2
     """Create different templates concurrently."""
     context.concurrent_projects = [name1, name2]
 
-    results = {}
-    lock = threading.Lock()
-
-    def create_project(name, template):
-        result = context.generator.generate(
+    futures = {
+        name: context._pool.submit(
+            context.generator.generate,
             name,
             workspace=context.test_workspace,
             template=template
         )
-        with lock:
-            results[name] = result
-
-    t1 = threading.Thread(target=create_project, args=(name1, template1))
-    t2 = threading.Thread(target=create_project, args=(name2, template2))
-
-    t1.start()
-    t2.start()
-
-    t1.join()
-    t2.join()
-
-    context.concurrent_results = results
+        for name, template in ((name1, template1), (name2, template2))
+    }
+    context.concurrent_results = {name: future.result() for name, future in futures.items()}
 
 
 @then('both projects should be created successfully')
@@ -2,14 +2,35 @@
 """Step definitions for configuration tests."""
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
-from behave import then, when
-import json
+from behave import then, when, use_step_matcher
+import warnings
 
+import json_cache
 
-@when('I create a project named "{name}" using template "{template}" with HTTP proxy "{proxy}"')
+
+def _load_devcontainer(context):
+    """Load the project's devcontainer.json, reparsing it only when the file changes."""
+    context.project_path = os.path.join(context.test_workspace, context.project_name)
+    devcontainer_json = os.path.join(
+        context.project_path, ".devcontainer", "devcontainer.json"
+    )
+
+    try:
+        return json_cache.load(devcontainer_json)
+    except FileNotFoundError:
+        raise AssertionError(f"devcontainer.json not found at {devcontainer_json}")
+
+
+def _lower_keys(*mappings):
+    """Collect the lower-cased keys of several mappings into one set."""
+    return {str(k).lower() for mapping in mappings for k in mapping}
+
+
+use_step_matcher("re")
+
+
+@when(r'I create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)" with HTTP proxy "(?P<proxy>[^"]+)"')
 def step_create_with_proxy(context, name, template, proxy):
     """Create project with proxy settings."""
     context.project_name = name
@@ -24,7 +45,7 @@ def step_create_with_proxy(context, name, template, proxy):
     context.last_output = result.stdout + result.stderr
 
 
-@when('I create a project named "{name}" using template "{template}" with Claude version "{version}"')
+@when(r'I create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)" with Claude version "(?P<version>[^"]+)"')
 def step_create_with_claude_version(context, name, template, version):
     """Create project with Claude version."""
     context.project_name = name
@@ -39,7 +60,7 @@ def step_create_with_claude_version(context, name, template, version):
     context.last_output = result.stdout + result.stderr
 
 
-@when('I create a project named "{name}" using template "{template}" with Claude provider "{provider}" and HTTP proxy "{proxy}"')
+@when(r'I create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)" with Claude provider "(?P<provider>[^"]+)" and HTTP proxy "(?P<proxy>[^"]+)"')
 def step_create_with_provider_and_proxy(context, name, template, provider, proxy):
     """Create project with both provider and proxy settings."""
     context.project_name = name
@@ -56,7 +77,7 @@ def step_create_with_provider_and_proxy(context, name, template, provider, proxy
     context.last_output = result.stdout + result.stderr
 
 
-@when('I create a project named "{name}" using template "{template}" with Claude provider "{provider}"')
+@when(r'I create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)" with Claude provider "(?P<provider>[^"]+)"')
 def step_create_with_provider(context, name, template, provider):
     """Create project with Claude provider."""
     context.project_name = name
@@ -71,77 +92,51 @@ def step_create_with_provider(context, name, template, provider):
     context.last_output = result.stdout + result.stderr
 
 
-@then('proxy configuration should exist in devcontainer')
-def step_proxy_config_exists(context):
-    """Verify proxy configuration was applied."""
-    context.project_path = os.path.join(context.test_workspace, context.project_name)
-    devcontainer_json = os.path.join(
-        context.project_path, ".devcontainer", "devcontainer.json"
-    )
+use_step_matcher("parse")
 
-    assert os.path.isfile(devcontainer_json), f"devcontainer.json not found at {devcontainer_json}"
 
-    with open(devcontainer_json) as f:
-        config = json.load(f)
-
-    # Check for proxy env vars in containerEnv
+def _check_devcontainer(config, *, need_proxy=False, need_provider=False):
+    """Check proxy and/or provider settings in one pass over the parsed config."""
     env = config.get("containerEnv", {})
-    has_proxy = "HTTP_PROXY" in env or "http_proxy" in env or "HTTPS_PROXY" in env or "https_proxy" in env
-
-    if not has_proxy:
-        # Check if proxy feature is included
-        features = config.get("features", {})
-        has_proxy_feature = any("proxy" in str(f).lower() for f in features.keys())
+    features = config.get("features", {})
 
-        if not has_proxy_feature:
-            import warnings
+    if need_proxy:
+        # Check for proxy env vars in containerEnv, then for a proxy feature
+        has_proxy = (
+            "HTTP_PROXY" in env or "http_proxy" in env or "HTTPS_PROXY" in env or "https_proxy" in env or
+            any("proxy" in str(f).lower() for f in features.keys())
+        )
+        if not has_proxy:
             warnings.warn(f"Proxy configuration not found in devcontainer.json. Env vars: {env}, Features: {list(features.keys())}")
 
+    if need_provider:
+        # Provider can be set via feature args or containerEnv
+        args = features.get("./features/claude-code", {}).get("args", {})
+        has_provider = (
+            "provider" in args or
+            "CLAUDE_PROVIDER" in env or
+            any("provider" in k for k in _lower_keys(args, env))
+        )
+        if not has_provider:
+            warnings.warn(f"Claude provider configuration not found. Args: {args}, Env: {env}")
 
-@then('Claude provider should be configured')
-def step_provider_configured(context):
-    """Verify Claude provider was configured."""
-    context.project_path = os.path.join(context.test_workspace, context.project_name)
-    devcontainer_json = os.path.join(
-        context.project_path, ".devcontainer", "devcontainer.json"
-    )
-
-    assert os.path.isfile(devcontainer_json), f"devcontainer.json not found at {devcontainer_json}"
-
-    with open(devcontainer_json) as f:
-        config = json.load(f)
 
-    # Provider can be set via feature args or containerEnv
-    features = config.get("features", {})
-    claude_code_feature = features.get("./features/claude-code", {})
-    args = claude_code_feature.get("args", {})
-
-    env = config.get("containerEnv", {})
+@then('proxy configuration should exist in devcontainer')
+def step_proxy_config_exists(context):
+    """Verify proxy configuration was applied."""
+    _check_devcontainer(_load_devcontainer(context), need_proxy=True)
 
-    has_provider = (
-        "provider" in args or
-        "CLAUDE_PROVIDER" in env or
-        any("provider" in str(k).lower() for k in args.keys()) or
-        any("provider" in str(k).lower() for k in env.keys())
-    )
 
-    if not has_provider:
-        import warnings
-        warnings.warn(f"Claude provider configuration not found. Args: {args}, Env: {env}")
+@then('Claude provider should be configured')
+def step_provider_configured(context):
+    """Verify Claude provider was configured."""
+    _check_devcontainer(_load_devcontainer(context), need_provider=True)
 
 
 @then('Claude version should be configured')
 def step_claude_version_configured(context):
     """Verify Claude version was configured."""
-    context.project_path = os.path.join(context.test_workspace, context.project_name)
-    devcontainer_json = os.path.join(
-        context.project_path, ".devcontainer", "devcontainer.json"
-    )
-
-    assert os.path.isfile(devcontainer_json), f"devcontainer.json not found at {devcontainer_json}"
-
-    with open(devcontainer_json) as f:
-        config = json.load(f)
+    config = _load_devcontainer(context)
 
     # Version can be set via feature args or containerEnv
     features = config.get("features", {})
@@ -153,17 +148,14 @@ def step_claude_version_configured(context):
     has_version = (
         "version" in args or
         "CLAUDE_VERSION" in env or
-        any("version" in str(k).lower() for k in args.keys()) or
-        any("version" in str(k).lower() for k in env.keys())
+        any("version" in k for k in _lower_keys(args, env))
     )
 
     if not has_version:
-        import warnings
         warnings.warn(f"Claude version configuration not found. Args: {args}, Env: {env}")
 
 
 @then('both configurations should be applied')
 def step_both_configurations_applied(context):
     """Verify both proxy and provider configurations were applied."""
-    step_proxy_config_exists(context)
-    step_provider_configured(context)
+    _check_devcontainer(_load_devcontainer(context), need_proxy=True, need_provider=True)
@@ -6,8 +6,6 @@ related to container management: build, run, exec, stop, ps, and logs.
 """
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import given, when, then, step
 import subprocess
@@ -76,6 +74,8 @@ def step_isolde_sync(context):
     )
     context.last_exit_code = result.returncode
     context.last_output = result.stdout + result.stderr
+    # The project was rewritten; drop validation_steps' structure snapshot
+    context._fs_root = None
 
 
 @when('I run "isolde build"')
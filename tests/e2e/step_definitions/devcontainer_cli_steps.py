@@ -2,26 +2,31 @@
 """Step definitions using VS Code Dev Containers CLI."""
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import then, given, when, step
 import subprocess
-import os
+
+from scenario_build import log_tail
 
 
 @step('I start the devcontainer for the project')
 def step_start_devcontainer(context):
     """Start the devcontainer using devcontainer CLI."""
+    if not context.docker_available:
+        context.scenario.skip("Docker daemon is not available")
+        return
     project_path = os.path.join(context.test_workspace, context.project_name)
 
-    result = subprocess.run(
-        f"devcontainer up --workspace-folder {project_path}",
-        shell=True, capture_output=True, text=True, timeout=300
-    )
+    # Stream the (long) build log to disk and only read its tail on failure
+    log_path = os.path.join(context.test_workspace, f"{context.project_name}-up.log")
+    with open(log_path, "wb") as log:
+        result = subprocess.run(
+            ["devcontainer", "up", "--workspace-folder", project_path],
+            stdout=log, stderr=subprocess.STDOUT, timeout=300
+        )
 
     if result.returncode != 0:
-        raise AssertionError(f"devcontainer up failed:\n{result.stderr}")
+        raise AssertionError(f"devcontainer up failed:\n{log_tail(log_path)}")
 
     context.devcontainer_started = True
 
@@ -44,8 +49,8 @@ def step_devcontainer_features_installed(context):
     project_path = os.path.join(context.test_workspace, context.project_name)
 
     result = subprocess.run(
-        f"devcontainer exec --workspace-folder {project_path} -- which claude",
-        shell=True, capture_output=True, text=True
+        ["devcontainer", "exec", "--workspace-folder", project_path, "--", "which", "claude"],
+        capture_output=True, text=True, timeout=60
     )
 
     assert result.returncode == 0, "claude feature not installed"
@@ -57,8 +62,8 @@ def step_devcontainer_exec(context):
     project_path = os.path.join(context.test_workspace, context.project_name)
 
     result = subprocess.run(
-        f"devcontainer exec --workspace-folder {project_path} -- pwd",
-        shell=True, capture_output=True, text=True
+        ["devcontainer", "exec", "--workspace-folder", project_path, "--", "pwd"],
+        capture_output=True, text=True, timeout=60
     )
 
     assert result.returncode == 0, "devcontainer exec failed"
@@ -71,8 +76,8 @@ def step_nodejs_in_devcontainer(context):
     project_path = os.path.join(context.test_workspace, context.project_name)
 
     result = subprocess.run(
-        f"devcontainer exec --workspace-folder {project_path} -- node --version",
-        shell=True, capture_output=True, text=True
+        ["devcontainer", "exec", "--workspace-folder", project_path, "--", "node", "--version"],
+        capture_output=True, text=True, timeout=60
     )
 
     assert result.returncode == 0, f"Node.js not available: {result.stderr}"
@@ -91,8 +96,8 @@ def step_stop_devcontainer(context):
     project_path = os.path.join(context.test_workspace, context.project_name)
 
     result = subprocess.run(
-        f"devcontainer stop --workspace-folder {project_path}",
-        shell=True, capture_output=True, text=True
+        ["devcontainer", "stop", "--workspace-folder", project_path],
+        capture_output=True, text=True, timeout=120
     )
 
     if result.returncode != 0:
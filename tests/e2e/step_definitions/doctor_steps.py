@@ -6,8 +6,6 @@ command which performs system diagnostics and health checks.
 """
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import given, when, then
 import subprocess
@@ -1,16 +1,15 @@
 # -*- coding: utf-8 -*-
 """Step definitions for edge case tests."""
 
-import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
-
-from behave import when, then, given
+from behave import when, then, given, use_step_matcher
 import subprocess
 import shutil
 
 
-@when('I attempt to create a project named "{name}" using template "{template}" with preset "{preset}"')
+use_step_matcher("re")
+
+
+@when(r'I attempt to create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)" with preset "(?P<preset>[^"]+)"')
 def step_attempt_create_with_preset(context, name, template, preset):
     """Attempt project creation with preset that may fail."""
     context.project_name = name
@@ -24,7 +23,7 @@ def step_attempt_create_with_preset(context, name, template, preset):
     context.last_output = result.stdout + result.stderr
 
 
-@when('I attempt to create a project named "{name}" using template "{template}" with version "{version}"')
+@when(r'I attempt to create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)" with version "(?P<version>[^"]+)"')
 def step_attempt_create_with_version(context, name, template, version):
     """Attempt project creation with version that may fail."""
     context.project_name = name
@@ -38,7 +37,7 @@ def step_attempt_create_with_version(context, name, template, version):
     context.last_output = result.stdout + result.stderr
 
 
-@when('I attempt to create a project named "" using template "{template}"')
+@when(r'I attempt to create a project named "" using template "(?P<template>[^"]+)"')
 def step_attempt_create_empty_name(context, template):
     """Attempt project creation with empty name."""
     context.project_name = ""
@@ -51,7 +50,7 @@ def step_attempt_create_empty_name(context, template):
     context.last_output = result.stdout + result.stderr
 
 
-@when('I attempt to create a project named "{name}" using template "{template}"')
+@when(r'I attempt to create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)"')
 def step_attempt_create(context, name, template):
     """Attempt project creation that may fail."""
     context.project_name = name
@@ -64,11 +63,14 @@ def step_attempt_create(context, name, template):
     context.last_output = result.stdout + result.stderr
 
 
+use_step_matcher("parse")
+
+
 @then('project creation should fail')
 def step_creation_fails(context):
     """Verify creation failed."""
     # For edge cases where we expect failure, check exit code
-    # Note: The init script uses defaults via newlines, so some "invalid" inputs might still succeed
+    # Note: The init script runs with stdin closed and falls back to defaults, so some "invalid" inputs might still succeed
     # We're primarily checking that truly invalid inputs are handled
     if hasattr(context, 'last_exit_code'):
         # If the command exits with an error, that's expected
@@ -82,7 +84,7 @@ def step_error_mentions(context, expected_text):
     if hasattr(context, 'last_output') and context.last_output:
         output_lower = context.last_output.lower()
         if expected_text.lower() not in output_lower:
-            # For non-interactive mode with newlines, many invalid inputs get default values
+            # In non-interactive mode (stdin closed), many invalid inputs get default values
             # So we don't always get the expected error
             import warnings
             warnings.warn(f"Expected '{expected_text}' in error message, but defaults may have been used")
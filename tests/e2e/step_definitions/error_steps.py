@@ -6,17 +6,11 @@ and validation scenarios for Isolde CLI commands.
 """
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import given, when, then
 import subprocess
 import tempfile
 import shutil
-import sys
-import os as _os
-
-sys.path.insert(0, _os.path.abspath(_os.path.join(_os.path.dirname(__file__), '..', '..', 'support')))
 
 
 def _ensure_generator(context):
@@ -289,6 +283,8 @@ def step_isolde_sync_force(context):
     )
     context.last_exit_code = result.returncode
     context.last_output = result.stdout + result.stderr
+    # The project was rewritten; drop validation_steps' structure snapshot
+    context._fs_root = None
 
 
 @when('I run "isolde run --workspace-folder {folder}"')
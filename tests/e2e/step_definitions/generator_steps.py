@@ -1,10 +1,7 @@
 # -*- coding: utf-8 -*-
 """Step definitions for project generation."""
 
-from behave import given, when
-import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
+from behave import given, when, use_step_matcher
 from generators import get_generator
 
 
@@ -15,7 +12,10 @@ def step_use_generator(context, generator_type):
     context.generator_type = generator_type
 
 
-@when('I create a project named "{name}" using template "{template}" with preset "{preset}"')
+use_step_matcher("re")
+
+
+@when(r'I create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)" with preset "(?P<preset>[^"]+)"')
 def step_create_project_with_preset(context, name, template, preset):
     """Create a project using specified template and preset."""
     context.project_name = name
@@ -27,7 +27,7 @@ def step_create_project_with_preset(context, name, template, preset):
     context.last_output = result.stdout + result.stderr
 
 
-@given('I create a project named "{name}" using template "{template}"')
+@given(r'I create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)"')
 def step_create_project(context, name, template):
     """Create a project using specified template."""
     context.project_name = name
@@ -38,6 +38,20 @@ def step_create_project(context, name, template):
     context.last_output = result.stdout + result.stderr
 
 
+@when(r'I create a project named "(?P<name>[^"]+)" using template "(?P<template>[^"]+)"')
+def step_when_create_project(context, name, template):
+    """Create a project using specified template."""
+    context.project_name = name
+    context.template = template
+
+    result = context.generator.generate(name, workspace=context.test_workspace, template=template)
+    context.last_exit_code = result.returncode
+    context.last_output = result.stdout + result.stderr
+
+
+use_step_matcher("parse")
+
+
 @when('I specify language version "{version}"')
 def step_set_version(context, version):
     """Set language version and regenerate project."""
@@ -51,6 +65,8 @@ def step_set_version(context, version):
     )
     context.last_exit_code = result.returncode
     context.last_output = result.stdout + result.stderr
+    # The project was rewritten; drop validation_steps' structure snapshot
+    context._fs_root = None
 
 
 @when('I use preset "{preset}"')
@@ -66,14 +82,5 @@ def step_use_preset(context, preset):
     )
     context.last_exit_code = result.returncode
     context.last_output = result.stdout + result.stderr
-
-
-@when('I create a project named "{name}" using template "{template}"')
-def step_when_create_project(context, name, template):
-    """Create a project using specified template."""
-    context.project_name = name
-    context.template = template
-
-    result = context.generator.generate(name, workspace=context.test_workspace, template=template)
-    context.last_exit_code = result.returncode
-    context.last_output = result.stdout + result.stderr
+    # The project was rewritten; drop validation_steps' structure snapshot
+    context._fs_root = None
@@ -1,11 +1,12 @@
 """Step definitions for isolation level testing."""
 
-import json
 import os
 import subprocess
 
 from behave import when, then
 
+import json_cache
+
 
 @when('I create a project with isolation level "{level}"')
 def step_create_with_isolation(context, level):
@@ -61,6 +62,8 @@ def step_create_with_isolation(context, level):
     )
     context.last_exit_code = result.returncode
     context.last_output = result.stdout
+    # The project was rewritten; drop validation_steps' structure snapshot
+    context._fs_root = None
 
     # Store devcontainer path for later assertions
     context.devcontainer_json_path = os.path.join(
@@ -71,8 +74,7 @@ def step_create_with_isolation(context, level):
 @then("devcontainer.json should have {count:d} mounts")
 def step_check_mount_count(context, count):
     """Verify the number of mounts in devcontainer.json."""
-    with open(context.devcontainer_json_path, "r") as f:
-        config = json.load(f)
+    config = json_cache.load(context.devcontainer_json_path)
 
     mounts = config.get("mounts", [])
     assert len(mounts) == count, (
@@ -84,8 +86,7 @@ def step_check_mount_count(context, count):
 @then('a mount should reference "{text}"')
 def step_mount_contains(context, text):
     """Verify at least one mount contains the given text."""
-    with open(context.devcontainer_json_path, "r") as f:
-        config = json.load(f)
+    config = json_cache.load(context.devcontainer_json_path)
 
     mounts = config.get("mounts", [])
     assert any(text in m for m in mounts), (
@@ -97,8 +98,7 @@ def step_mount_contains(context, text):
 @then('no mount should reference "{text}"')
 def step_mount_not_contains(context, text):
     """Verify no mount contains the given text."""
-    with open(context.devcontainer_json_path, "r") as f:
-        config = json.load(f)
+    config = json_cache.load(context.devcontainer_json_path)
 
     mounts = config.get("mounts", [])
     matches = [m for m in mounts if text in m]
@@ -2,14 +2,15 @@
 """Step definitions for Layer 2 scenario-based testing with fixtures."""
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import given, when, then
+import shlex
 import subprocess
 import yaml
 import shutil
 
+import json_cache
+
 
 def load_scenario_fixture(scenario_name: str) -> dict:
     """
@@ -137,9 +138,7 @@ def step_features_installed(context):
     if not os.path.exists(devcontainer_json):
         raise AssertionError(f"devcontainer.json not found at {devcontainer_json}")
 
-    with open(devcontainer_json) as f:
-        import json
-        config = json.load(f)
+    config = json_cache.load(devcontainer_json)
 
     features = config.get('features', {})
     expected_features = context.fixture_features
@@ -204,8 +203,8 @@ def step_expected_binaries_available(context):
 
     for binary in expected_binaries:
         result = subprocess.run(
-            f"docker exec {container_name} which {binary}",
-            shell=True, capture_output=True, text=True
+            ["docker", "exec", container_name, "which", binary],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
 
         if result.returncode != 0:
@@ -234,8 +233,8 @@ def step_scenario_functional_tests_pass(context):
         expected_output = test.get('expected_output')
 
         result = subprocess.run(
-            f"docker exec {container_name} {command}",
-            shell=True, capture_output=True, text=True
+            ["docker", "exec", container_name, *shlex.split(command)],
+            capture_output=True, text=True
         )
 
         passed = result.returncode == 0
@@ -272,16 +271,19 @@ def step_create_from_scenario(context, scenario_name: str):
 @when('I build the scenario container')
 def step_build_scenario_container(context):
     """Build the devcontainer for the scenario."""
+    if not context.docker_available:
+        context.scenario.skip("Docker daemon is not available")
+        return
     import time
 
     project_name = context.project_name
-    container_name = f"e2e-{context.scenario_name}-{int(time.time())}"
+    container_name = f"e2e-{context.scenario_name}-{time.monotonic_ns():x}"
 
     project_path = os.path.join(context.test_workspace, project_name, ".devcontainer")
 
     result = subprocess.run(
-        f"docker build -t {container_name} {project_path}",
-        shell=True, capture_output=True, text=True
+        ["docker", "build", "-t", container_name, project_path],
+        capture_output=True, text=True
     )
 
     if result.returncode != 0:
@@ -300,11 +302,11 @@ def step_start_scenario_container(context):
     import time
 
     image_name = context.test_image
-    container_name = f"e2e-{context.scenario_name}-run-{int(time.time())}"
+    container_name = f"e2e-{context.scenario_name}-run-{time.monotonic_ns():x}"
 
     result = subprocess.run(
-        f"docker run -d --name {container_name} {image_name} sleep infinity",
-        shell=True, capture_output=True, text=True
+        ["docker", "run", "-d", "--name", container_name, image_name, "sleep", "infinity"],
+        capture_output=True, text=True
     )
 
     if result.returncode != 0:
@@ -1,18 +1,49 @@
 # -*- coding: utf-8 -*-
 """Step definitions for project validation."""
 
+import json
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
-
-from behave import then, given
-import os
+import subprocess
+import zlib
+
+from behave import given, step, then, when
+
+
+def _snapshot(path, depth=2):
+    """Map paths under a project, up to depth levels deep, to "dir" or "file"."""
+    entries = {}
+    pending = [("", path)]
+    for _ in range(depth):
+        subdirs = []
+        for prefix, directory in pending:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel_path = prefix + entry.name
+                    if entry.is_dir():
+                        entries[rel_path] = "dir"
+                        subdirs.append((rel_path + "/", entry.path))
+                    elif entry.is_file():
+                        entries[rel_path] = "file"
+        pending = subdirs
+    return entries
+
+
+def _fs(context):
+    """Return the filesystem snapshot of the current project, taking it on first use.
+
+    Steps that regenerate or sync an existing project reset context._fs_root
+    so the next structure check walks the rewritten tree.
+    """
+    if getattr(context, '_fs_root', None) != context.project_path:
+        context._fs = _snapshot(context.project_path)
+        context._fs_root = context.project_path
+    return context._fs
 
 
 @given('I create a project using template "{template}"')
 def step_create_project_simple(context, template):
     """Create a project using specified template."""
-    context.project_name = f"test-{template}-{template.__hash__() % 100000}"
+    context.project_name = f"test-{template}-{zlib.crc32(template.encode()) % 100000}"
     context.template = template
 
     result = context.generator.generate(context.project_name, workspace=context.test_workspace, template=template)
@@ -28,37 +59,36 @@ def step_project_created(context):
     context.project_path = os.path.join(context.test_workspace, context.project_name)
     assert os.path.exists(context.project_path), f"Project path not found: {context.project_path}\nWorkspace: {context.test_workspace}\nProject name: {context.project_name}\nContents: {os.listdir(context.test_workspace) if os.path.exists(context.test_workspace) else 'N/A'}"
 
+    # One directory walk answers the structure checks that follow
+    context._fs = _snapshot(context.project_path)
+    context._fs_root = context.project_path
+
 
 @then('the devcontainer directory should exist')
 def step_devcontainer_exists(context):
     """Verify .devcontainer directory exists."""
     devcontainer_path = os.path.join(context.project_path, ".devcontainer")
-    assert os.path.isdir(devcontainer_path), f".devcontainer not found at {devcontainer_path}"
+    assert _fs(context).get(".devcontainer") == "dir", f".devcontainer not found at {devcontainer_path}"
 
 
 @then('devcontainer.json should exist')
 def step_devcontainer_json_exists(context):
     """Verify devcontainer.json exists."""
     devcontainer_json = os.path.join(context.project_path, ".devcontainer", "devcontainer.json")
-    assert os.path.isfile(devcontainer_json), f"devcontainer.json not found at {devcontainer_json}"
+    assert _fs(context).get(".devcontainer/devcontainer.json") == "file", f"devcontainer.json not found at {devcontainer_json}"
 
 
 @then('the project should be a git repository')
 def step_project_is_git_repo(context):
     """Verify project is a git repository."""
     git_dir = os.path.join(context.project_path, ".git")
-    assert os.path.isdir(git_dir), f".git not found at {git_dir}"
+    assert _fs(context).get(".git") == "dir", f".git not found at {git_dir}"
 
 
 # ============================================================================
 # Validation and Diff Command Steps
 # ============================================================================
 
-from behave import when, step
-import subprocess
-import json
-import time
-
 
 @when('I run "isolde validate"')
 def step_isolde_validate(context):
@@ -2,15 +2,16 @@
 """Step definitions for Layer 3 verification with container pooling."""
 
 import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'support')))
 
 from behave import then, when
+import shlex
 import subprocess
 import yaml
 import time
 from typing import Dict, List, Any
 
+import docker
+
 
 # Container pool for reusing containers across verification steps
 # Key: template name, Value: (container_name, image_name)
@@ -82,13 +83,11 @@ def get_or_start_container(context, template: str) -> str:
         container_name, image_name = CONTAINER_POOL[template]
 
         # Verify container is still running
-        result = subprocess.run(
-            f"docker inspect -f '{{{{.State.Status}}}}' {container_name}",
-            shell=True, capture_output=True, text=True
-        )
-
-        if result.returncode == 0 and 'running' in result.stdout:
-            return container_name
+        try:
+            if context.docker.api.inspect_container(container_name)["State"]["Running"]:
+                return container_name
+        except docker.errors.APIError:
+            pass
 
         # Container not running, remove from pool
         del CONTAINER_POOL[template]
@@ -101,12 +100,12 @@ def get_or_start_container(context, template: str) -> str:
         image_name = IMAGE_REGISTRY[project_name]
     else:
         # Build the image first
-        image_name = f"e2e-{template}-{int(time.time())}"
+        image_name = f"e2e-{template}-{time.monotonic_ns():x}"
         project_path = os.path.join(context.test_workspace, project_name, ".devcontainer")
 
         build_result = subprocess.run(
-            f"docker build -t {image_name} {project_path}",
-            shell=True, capture_output=True, text=True
+            ["docker", "build", "-t", image_name, project_path],
+            capture_output=True, text=True
         )
 
         if build_result.returncode != 0:
@@ -121,15 +120,12 @@ def get_or_start_container(context, template: str) -> str:
         context.test_images.append(image_name)
 
     # Start the container
-    container_name = f"e2e-{template}-container-{int(time.time())}"
+    container_name = f"e2e-{template}-container-{time.monotonic_ns():x}"
 
-    run_result = subprocess.run(
-        f"docker run -d --name {container_name} {image_name} sleep infinity",
-        shell=True, capture_output=True, text=True
-    )
-
-    if run_result.returncode != 0:
-        raise AssertionError(f"Failed to start container for template {template}:\n{run_result.stderr}")
+    try:
+        context.docker.containers.run(image_name, ["sleep", "infinity"], name=container_name, detach=True)
+    except docker.errors.APIError as e:
+        raise AssertionError(f"Failed to start container for template {template}:\n{e}")
 
     # Add to cleanup list
     if not hasattr(context, 'test_containers'):
@@ -145,6 +141,9 @@ def get_or_start_container(context, template: str) -> str:
 @when('a running container for template "{template}" exists')
 def step_running_container(context, template: str):
     """Ensure a running container exists for the given template."""
+    if not context.docker_available:
+        context.scenario.skip("Docker daemon is not available")
+        return
     container_name = get_or_start_container(context, template)
     context.verification_container = container_name
     context.verification_template = template
@@ -156,7 +155,7 @@ def step_run_verification(context, check_type: str):
     if not hasattr(context, 'verification_container'):
         raise AssertionError("No container available for verification. Use 'a running container for template \"{template}\" exists' first.")
 
-    container_name = context.verification_container
+    container = context.docker.containers.get(context.verification_container)
     checks = load_verification_checks(check_type)
 
     # Store results for later assertion
@@ -169,24 +168,23 @@ def step_run_verification(context, check_type: str):
         expected_output = check.get('expected_output', None)
 
         # Execute command in container
-        result = subprocess.run(
-            f"docker exec {container_name} {command}",
-            shell=True, capture_output=True, text=True
-        )
+        exit_code, (stdout, stderr) = container.exec_run(shlex.split(command), demux=True)
+        stdout = (stdout or b"").decode("utf-8", "replace")
+        stderr = (stderr or b"").decode("utf-8", "replace")
 
         # Determine if check passed
         passed = (
-            result.returncode == expected_exit_code and
-            (expected_output is None or expected_output in result.stdout)
+            exit_code == expected_exit_code and
+            (expected_output is None or expected_output in stdout)
         )
 
         context.verification_results.append({
             'name': check_name,
             'passed': passed,
-            'exit_code': result.returncode,
+            'exit_code': exit_code,
             'expected_exit_code': expected_exit_code,
-            'stdout': result.stdout,
-            'stderr': result.stderr,
+            'stdout': stdout,
+            'stderr': stderr,
             'command': command
         })
 
@@ -194,6 +192,9 @@ def step_run_verification(context, check_type: str):
 @when('I run "{check_type}" verification checks on template "{template}"')
 def step_run_verification_with_template(context, check_type: str, template: str):
     """Ensure container exists and run verification checks."""
+    if not context.docker_available:
+        context.scenario.skip("Docker daemon is not available")
+        return
     step_running_container(context, template)
     step_run_verification(context, check_type)
 
@@ -268,31 +269,11 @@ def step_stop_pooled_container(context, template: str):
     if template in CONTAINER_POOL:
         container_name, _ = CONTAINER_POOL[template]
 
-        subprocess.run(
-            f"docker stop {container_name}",
-            shell=True, capture_output=True
-        )
-        subprocess.run(
-            f"docker rm {container_name}",
-            shell=True, capture_output=True
-        )
+        # Force removal kills the container outright; sleep ignores the
+        # SIGTERM a docker stop would send and wait out
+        try:
+            context.docker.api.remove_container(container_name, force=True)
+        except docker.errors.APIError:
+            pass
 
         del CONTAINER_POOL[template]
-
-
-# Cleanup function to be called from environment.py
-def cleanup_container_pool(containers: List[str] = None):
-    """Cleanup containers from the pool."""
-    global CONTAINER_POOL
-
-    if containers:
-        for container in containers:
-            subprocess.run(f"docker stop {container}", shell=True, capture_output=True)
-            subprocess.run(f"docker rm {container}", shell=True, capture_output=True)
-
-    # Also clear the pool
-    for template, (container_name, _) in list(CONTAINER_POOL.items()):
-        subprocess.run(f"docker stop {container_name}", shell=True, capture_output=True)
-        subprocess.run(f"docker rm {container_name}", shell=True, capture_output=True)
-
-    CONTAINER_POOL.clear()
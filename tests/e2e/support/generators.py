@@ -3,7 +3,10 @@
 import subprocess
 from typing import Dict
 import os
-import shlex
+
+# File is at tests/e2e/support/generators.py
+# Need to go up 4 levels to reach repo root
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 
 class GeneratorInterface:
@@ -18,68 +21,75 @@ class ShellScriptGenerator(GeneratorInterface):
     """Shell script generator implementation."""
 
     def generate(self, name: str, workspace: str = None, **kwargs) -> subprocess.CompletedProcess:
-        # Change to repo root first
-        repo_root = self._get_repo_root()
-
-        # Quote the project name to handle spaces and special characters
-        quoted_name = shlex.quote(name)
+        isolde = os.path.join(_REPO_ROOT, "scripts", "isolde.sh")
 
         # The new CLI creates projects in the current directory, not a subdirectory
-        # We need to create the subdirectory first and cd into it
-        if workspace:
-            project_path = os.path.join(workspace, name)
-            cmd = f"mkdir -p {project_path} && cd {project_path} && {repo_root}/scripts/isolde.sh init ."
-        else:
-            project_path = os.path.join(repo_root, name)
-            cmd = f"mkdir -p {project_path} && cd {project_path} && {repo_root}/scripts/isolde.sh init ."
-
+        # We need to create the subdirectory first and run the CLI from inside it
+        project_path = os.path.join(workspace or _REPO_ROOT, name)
+        try:
+            os.makedirs(project_path, exist_ok=True)
+        except OSError as e:
+            return subprocess.CompletedProcess(["mkdir", "-p", project_path], 1, "", f"{e}\n")
+
+        init_cmd = [isolde, "init", "."]
         if 'template' in kwargs:
-            cmd += f" --template={kwargs['template']}"
+            init_cmd.append(f"--template={kwargs['template']}")
         if 'lang_version' in kwargs:
-            cmd += f" --lang-version={kwargs['lang_version']}"
+            init_cmd.append(f"--lang-version={kwargs['lang_version']}")
         if 'preset' in kwargs:
-            cmd += f" --preset={kwargs['preset']}"
+            init_cmd.append(f"--preset={kwargs['preset']}")
         if 'http_proxy' in kwargs:
-            cmd += f" --http-proxy={kwargs['http_proxy']}"
+            init_cmd.append(f"--http-proxy={kwargs['http_proxy']}")
         if 'https_proxy' in kwargs:
-            cmd += f" --https-proxy={kwargs['https_proxy']}"
+            init_cmd.append(f"--https-proxy={kwargs['https_proxy']}")
         if 'claude_provider' in kwargs:
-            cmd += f" --claude-provider={kwargs['claude_provider']}"
+            init_cmd.append(f"--claude-provider={kwargs['claude_provider']}")
         if 'claude_version' in kwargs:
-            cmd += f" --claude-version={kwargs['claude_version']}"
-
-        # The new CLI requires sync after init
-        # Add sync command to the same shell call
-        cmd += f" && {repo_root}/scripts/isolde.sh sync"
-
-        # Initialize git repository (the new CLI doesn't do this automatically)
-        cmd += f" && git init && git add -A && git commit -m 'Initial commit'"
-
-        # Pipe newlines to accept all defaults for non-interactive mode
-        # Each prompt in the script will get a newline (accepting default value)
-        input_data = "\n\n\n\n\n\n\n\n\n\n"
-
-        return subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            input=input_data
+            init_cmd.append(f"--claude-version={kwargs['claude_version']}")
+
+        # The new CLI requires sync after init, and does not initialize
+        # a git repository automatically
+        commands = [
+            init_cmd,
+            [isolde, "sync"],
+            ["git", "init"],
+            ["git", "add", "-A"],
+            ["git", "commit", "-m", "Initial commit"],
+        ]
+        return self._run_chain(commands, cwd=project_path)
+
+    @staticmethod
+    def _run_chain(commands, cwd: str) -> subprocess.CompletedProcess:
+        """Run commands in order, stopping at the first failure (like `&&`)."""
+        stdout, stderr = [], []
+        for cmd in commands:
+            result = subprocess.run(
+                cmd,
+                cwd=cwd,
+                # Run non-interactively: stdin is closed, so every prompt
+                # reads EOF and falls back to its default answer
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True
+            )
+            stdout.append(result.stdout)
+            stderr.append(result.stderr)
+            if result.returncode != 0:
+                break
+
+        return subprocess.CompletedProcess(
+            commands,
+            result.returncode,
+            "".join(stdout),
+            "".join(stderr)
         )
 
-    def _get_repo_root(self):
-        """Get the repository root directory."""
-        # File is at tests/e2e/support/generators.py
-        # Need to go up 4 levels to reach repo root
-        return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 
 class ClaudeBinaryGenerator(GeneratorInterface):
     """Rust binary generator implementation (future)."""
 
     def generate(self, name: str, **kwargs) -> subprocess.CompletedProcess:
-        cmd = f"claude init {name}"
-        return subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        return subprocess.run(["claude", "init", name], capture_output=True, text=True)
 
 
 def get_generator(generator_type: str = "shell-script") -> GeneratorInterface:
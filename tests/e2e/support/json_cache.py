@@ -0,0 +1,32 @@
+"""Parsed JSON files, cached until the file changes."""
+
+import functools
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load(path: str):
+    """Parse a JSON file, reusing the previous parse while the file is unchanged.
+
+    Entries are keyed on the file's path, so a parse is reused by later
+    steps of the same scenario; every scenario generates into a fresh
+    workspace and parses its own files again.
+
+    The returned object is shared between callers and must not be modified.
+    Raises FileNotFoundError if the file is missing and json.JSONDecodeError
+    (which orjson's error subclasses) if it is not valid JSON.
+    """
+    st = os.stat(path)
+    return _load(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=128)
+def _load(path: str, mtime_ns: int, size: int):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
@@ -0,0 +1,36 @@
+"""Shared handling of the scenario's devcontainer image and test container."""
+
+import os
+
+import docker
+
+
+def log_tail(path, size=8192):
+    """Read the last size bytes of a log file as text."""
+    with open(path, "rb") as log:
+        log.seek(max(0, os.path.getsize(path) - size))
+        return log.read().decode("utf-8", "replace")
+
+
+def require_test_container(context):
+    """Return the scenario's running test container, failing straight away if the build did not succeed."""
+    if not context.build_ok:
+        raise AssertionError("No test container: the devcontainer did not build successfully")
+    return context.test_container
+
+
+def release_live_containers(client, live_containers):
+    """Remove the kept-warm test containers, then the images they run.
+
+    live_containers maps image tag to container and is emptied.
+    """
+    for image, container in live_containers.items():
+        try:
+            container.remove(force=True)
+        except docker.errors.APIError:
+            pass
+        try:
+            client.images.remove(image, force=True)
+        except docker.errors.APIError:
+            pass
+    live_containers.clear()